@@ -0,0 +1,558 @@
+#!/usr/bin/env python
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# SPDX-License-Identifier: MIT
+# See https://github.com/nexB/pip-requirements-parser for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+"""
+Benchmarks for pip-requirements-parser.
+NOTE: this should use ONLY the standard library and pip-requirements-parser.
+
+Each benchmark runs an operation on a synthetic requirements corpus and reports
+its best time, throughput in lines and bytes per second and peak memory.
+Results can be saved as JSON and compared with the results of another commit.
+
+Run with::
+
+    python etc/scripts/benchmarks.py --output results.json
+    python etc/scripts/benchmarks.py --compare results.json
+
+Set the PIP_REQUIREMENTS_PARSER_SRC environment variable to benchmark the
+source directory of another checkout, such as a baseline commit.
+"""
+
+SRC_DIR = os.environ.get("PIP_REQUIREMENTS_PARSER_SRC") or os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "src"
+)
+sys.path.insert(0, SRC_DIR)
+
+import pip_requirements_parser  # NOQA
+
+# The maximum import time in milliseconds of pip_requirements_parser and its
+# dependencies not already imported by Python at start up.
+IMPORT_TIME_BUDGET_MS = 80
+
+# fail a comparison if a benchmark is this many times slower than the baseline
+REGRESSION_THRESHOLD = 1.25
+
+
+################################################################################
+# Synthetic corpora generators. Each returns the text of a requirements file
+# with about ``size`` requirements.
+
+
+def fake_digest(i, length=64):
+    return (format(i, "x") * length)[:length]
+
+
+def generate_hash_heavy(size):
+    """
+    Return a pip-compile --generate-hashes style lock file text with 20 hashes
+    per requirement.
+    """
+    lines = []
+    for i in range(size):
+        lines.append(f"package-{i}=={i % 10}.{i % 7}.{i % 3} \\")
+        hashes = [f"    --hash=sha256:{fake_digest(i * 20 + h)}" for h in range(20)]
+        lines.append(" \\\n".join(hashes))
+        lines.append(f"    # via parent-{i}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_marker_heavy(size):
+    """
+    Return a requirements file text where each requirement has a marker.
+    """
+    markers = [
+        'python_version >= "3.7"',
+        'sys_platform == "win32" and python_version < "3.10"',
+        'platform_machine != "aarch64" or implementation_name == "pypy"',
+        'extra == "test"',
+    ]
+    lines = [
+        f"package-{i}[extra{i % 3}]>=1.{i % 9},<2.{i % 5} ; {markers[i % len(markers)]}"
+        for i in range(size)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def generate_url_heavy(size):
+    """
+    Return a requirements file text with VCS URLs, archive URLs, name@URL and
+    editable requirements.
+    """
+    lines = []
+    for i in range(size):
+        kind = i % 4
+        if kind == 0:
+            lines.append(f"git+https://github.com/org/repo-{i}.git@v{i}#egg=repo-{i}")
+        elif kind == 1:
+            lines.append(f"https://example.com/packages/package-{i}-1.0.tar.gz")
+        elif kind == 2:
+            lines.append(f"package-{i} @ https://example.com/package_{i}-1.0-py3-none-any.whl")
+        else:
+            lines.append(f"-e git+https://github.com/org/editable-{i}.git#egg=editable-{i}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_continuation_heavy(size):
+    """
+    Return a requirements file text where requirements and options are folded
+    on several lines with comments.
+    """
+    lines = []
+    for i in range(size):
+        lines.append(f"# comment about package-{i}")
+        lines.append(f"package-{i} \\")
+        lines.append("    >=1.0 \\")
+        lines.append("    ; python_version >= '3.6'  # trailing comment")
+        if i % 10 == 0:
+            lines.append("--extra-index-url \\")
+            lines.append(f"    https://example.com/simple-{i}/")
+    return "\n".join(lines) + "\n"
+
+
+CORPORA = {
+    "hash-heavy": generate_hash_heavy,
+    "marker-heavy": generate_marker_heavy,
+    "url-heavy": generate_url_heavy,
+    "continuation-heavy": generate_continuation_heavy,
+}
+
+
+def write_nested_tree(directory, size, depth=20):
+    """
+    Write a chain of ``depth`` requirements files in ``directory`` each
+    including the next one with -r and return the path to the first one.
+    """
+    per_file = max(1, size // depth)
+    for level in range(depth):
+        lines = [f"level{level}-package-{i}=={i}.0" for i in range(per_file)]
+        if level + 1 < depth:
+            lines.append(f"-r level-{level + 1}/requirements.txt")
+        level_dir = os.path.join(directory, *[f"level-{n}" for n in range(1, level + 1)])
+        os.makedirs(level_dir, exist_ok=True)
+        with open(os.path.join(level_dir, "requirements.txt"), "w") as out:
+            out.write("\n".join(lines) + "\n")
+    return os.path.join(directory, "requirements.txt")
+
+
+def generate_advisories(count, packages=5000):
+    """
+    Return a list of ``count`` OSV-style advisories for ``packages`` packages
+    each with two affected ranges and a few explicit versions.
+    """
+    advisories = []
+    for i in range(count):
+        package = i % packages
+        major = i % 7
+        advisories.append({
+            "id": f"PYSEC-{i:06d}",
+            "affected": [{
+                "package": {"ecosystem": "PyPI", "name": f"Package_{package}"},
+                "ranges": [{"type": "ECOSYSTEM", "events": [
+                    {"introduced": "0" if major == 0 else f"{major}.0"},
+                    {"fixed": f"{major}.{i % 10 + 1}"},
+                    {"introduced": f"{major + 1}.{i % 3}"},
+                    {"last_affected": f"{major + 1}.{i % 3 + 2}.1"},
+                ]}],
+                "versions": [f"{major}.{i % 10}.{n}" for n in range(3)],
+            }],
+        })
+    return advisories
+
+
+################################################################################
+# Benchmark runner
+
+
+def measure(function, repeat):
+    """
+    Return a tuple of (best time in seconds, peak memory in bytes) to call
+    ``function`` ``repeat`` times. Peak memory is measured in a separate call.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak
+
+
+def get_operations(filename, include_nested=False, repeat=1):
+    """
+    Return a list of (operation name, function) to benchmark on a requirements
+    ``filename`` with functions called up to ``repeat`` + 1 times.
+    """
+    RequirementsFile = pip_requirements_parser.RequirementsFile
+    rf = RequirementsFile.from_file(filename, include_nested=include_nested)
+    # a new RequirementsFile for each call to time a one-shot dumps() as when
+    # each file is dumped once, without anything cached by a previous call
+    fresh = [
+        RequirementsFile.from_file(filename, include_nested=include_nested)
+        for _ in range(repeat + 1)
+    ]
+
+    operations = [
+        ("from_file", lambda: RequirementsFile.from_file(filename, include_nested)),
+        ("parse", lambda: list(RequirementsFile.parse(filename, include_nested))),
+        ("to_dict", lambda: rf.to_dict()),
+        ("dumps", lambda: fresh.pop().dumps()),
+        ("dumps_repeated", lambda: rf.dumps()),
+    ]
+    if not include_nested:
+        with open(filename) as inp:
+            text = inp.read()
+        operations.insert(1, ("from_string", lambda: RequirementsFile.from_string(text)))
+    return operations
+
+
+def get_corpus_stats(filename, include_nested=False):
+    """
+    Return a tuple of (lines, bytes) for a requirements ``filename`` and its
+    nested files if ``include_nested``.
+    """
+    filenames = [filename]
+    if include_nested:
+        directory = os.path.dirname(filename)
+        filenames = [
+            os.path.join(top, name)
+            for top, _, names in os.walk(directory)
+            for name in names
+        ]
+    lines = size = 0
+    for fn in filenames:
+        with open(fn, "rb") as inp:
+            content = inp.read()
+        lines += content.count(b"\n")
+        size += len(content)
+    return lines, size
+
+
+def bench_corpora(size, repeat, only=None):
+    """
+    Return a mapping of {benchmark name: metrics} for each operation on each
+    corpus, printing results as they come.
+    """
+    results = {}
+    work_dir = tempfile.mkdtemp()
+    try:
+        corpora = []
+        for name, generator in CORPORA.items():
+            filename = os.path.join(work_dir, f"{name}.txt")
+            with open(filename, "w") as out:
+                out.write(generator(size))
+            corpora.append((name, filename, False))
+
+        tree_dir = os.path.join(work_dir, "nested-tree")
+        corpora.append(("nested-tree", write_nested_tree(tree_dir, size), True))
+
+        for corpus, filename, include_nested in corpora:
+            lines, nbytes = get_corpus_stats(filename, include_nested)
+            for operation, function in get_operations(filename, include_nested, repeat):
+                name = f"{corpus}/{operation}"
+                if only and not any(o in name for o in only):
+                    continue
+                seconds, peak = measure(function, repeat)
+                results[name] = dict(
+                    seconds=seconds,
+                    lines_per_second=lines / seconds,
+                    bytes_per_second=nbytes / seconds,
+                    peak_memory_bytes=peak,
+                )
+                print(
+                    f"{name:40} {seconds * 1000:10.1f} ms "
+                    f"{lines / seconds:12.0f} lines/s "
+                    f"{peak / 1024:10.0f} KB peak"
+                )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def bench_advisories(count, repeat, only=None):
+    """
+    Return a mapping of {benchmark name: metrics} for loading, compiling and
+    matching requirements against a database of ``count`` advisories.
+    """
+    AdvisoryDatabase = pip_requirements_parser.AdvisoryDatabase
+    RequirementsFile = pip_requirements_parser.RequirementsFile
+
+    results = {}
+    work_dir = tempfile.mkdtemp()
+    try:
+        database = os.path.join(work_dir, "advisories.json")
+        with open(database, "w") as out:
+            json.dump(generate_advisories(count), out)
+
+        requirements = os.path.join(work_dir, "requirements.txt")
+        with open(requirements, "w") as out:
+            for i in range(10000):
+                if i % 2:
+                    out.write(f"package-{i % 6000}=={i % 8}.{i % 11}\n")
+                else:
+                    out.write(f"package-{i % 6000}>={i % 8}.0,<{i % 8}.5\n")
+        rf = RequirementsFile.from_file(requirements)
+
+        db = AdvisoryDatabase.load(database)
+        db.compile()
+
+        def compile_all():
+            db._compiled.clear()
+            db.compile()
+
+        operations = [
+            ("load", lambda: AdvisoryDatabase.load(database)),
+            ("compile", compile_all),
+            ("match", lambda: db.match([rf])),
+        ]
+        for operation, function in operations:
+            name = f"advisories-{count}/{operation}"
+            if only and not any(o in name for o in only):
+                continue
+            seconds, peak = measure(function, repeat)
+            results[name] = dict(seconds=seconds, peak_memory_bytes=peak)
+            print(f"{name:40} {seconds * 1000:10.1f} ms {peak / 1024:41.0f} KB peak")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def bench_decode(megabytes, repeat, only=None):
+    """
+    Return a mapping of {benchmark name: metrics} for decoding ``megabytes``
+    of requirements text with and without a BOM or encoding declaration, at
+    once and as a stream of chunks.
+    """
+    import codecs
+
+    auto_decode = pip_requirements_parser.auto_decode
+    decode_stream = pip_requirements_parser.decode_stream
+
+    text = generate_hash_heavy(1000)
+    text = text * (megabytes * 1024 * 1024 // len(text) + 1)
+    inputs = [
+        ("ascii", text.encode("ascii")),
+        ("utf-8", codecs.BOM_UTF8 + ("# café\n" + text).encode("utf-8")),
+        ("latin-1", ("# coding=latin-1\n# café\n" + text).encode("latin-1")),
+        ("utf-16", codecs.BOM_UTF16_LE + text.encode("utf-16-le")),
+    ]
+
+    def stream(data, size=64 * 1024):
+        chunks = (data[i : i + size] for i in range(0, len(data), size))
+        for _ in decode_stream(chunks):
+            pass
+
+    results = {}
+    for encoding, data in inputs:
+        operations = [
+            ("auto_decode", lambda: auto_decode(data)),
+            ("decode_stream", lambda: stream(data)),
+        ]
+        for operation, function in operations:
+            name = f"decode-{megabytes}mb-{encoding}/{operation}"
+            if only and not any(o in name for o in only):
+                continue
+            seconds, peak = measure(function, repeat)
+            results[name] = dict(
+                seconds=seconds,
+                bytes_per_second=len(data) / seconds,
+                peak_memory_bytes=peak,
+            )
+            print(
+                f"{name:40} {seconds * 1000:10.1f} ms "
+                f"{len(data) / seconds / 1024 / 1024:12.0f} MB/s  "
+                f"{peak / 1024:10.0f} KB peak"
+            )
+    return results
+
+
+def measure_import_time(runs=10):
+    """
+    Return a list of import times in milliseconds of pip_requirements_parser,
+    each measured in a new Python process with -X importtime.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([SRC_DIR, env.get("PYTHONPATH", "")])
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import pip_requirements_parser"],
+            env=env,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            _, _, cumulative, name = line.replace("|", ":").split(":")
+            if name.strip() == "pip_requirements_parser":
+                timings.append(int(cumulative) / 1000)
+    return timings
+
+
+def bench_import_time(runs=10):
+    """
+    Return a mapping of {benchmark name: metrics} for the import time.
+    """
+    timings = measure_import_time(runs=runs)
+    best = min(timings) / 1000
+    median = statistics.median(timings) / 1000
+    print(f"{'import':40} {best * 1000:10.1f} ms (median: {median * 1000:.1f} ms)")
+    return {"import": dict(seconds=best, median_seconds=median)}
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=SRC_DIR,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Print a comparison of ``results`` with ``baseline`` results and return a
+    list of the names of benchmarks that regressed beyond ``threshold``.
+    """
+    regressions = []
+    print()
+    print(f"comparison with baseline at commit: {baseline.get('commit')}")
+    for name, metrics in sorted(results.items()):
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        ratio = metrics["seconds"] / base["seconds"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:40} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def run_benchmarks():
+    parser = argparse.ArgumentParser(description="Run pip-requirements-parser benchmarks.")
+    parser.add_argument(
+        "names",
+        nargs="*",
+        metavar="NAME",
+        help="Run only the benchmarks whose name contains one of these strings.",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=1000,
+        help="Number of requirements of each synthetic corpus (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--advisories",
+        type=int,
+        default=100000,
+        help="Number of advisories of the synthetic advisories database "
+        "(default: %(default)s).",
+    )
+    parser.add_argument(
+        "--decode-size",
+        type=int,
+        default=8,
+        metavar="MB",
+        help="Size in megabytes of the decoded texts (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of timed runs of each benchmark (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Save the results as JSON to FILE.",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="Compare with JSON results saved in FILE and fail on regressions.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="Slowdown ratio above which a benchmark is a regression "
+        "(default: %(default)s).",
+    )
+    parser.add_argument(
+        "--import-time-budget",
+        type=float,
+        default=IMPORT_TIME_BUDGET_MS,
+        metavar="MS",
+        help="Fail if the best import time is above this number of milliseconds.",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    results = {}
+    if not args.names or any(n in "import" for n in args.names):
+        results.update(bench_import_time())
+        if results["import"]["seconds"] * 1000 > args.import_time_budget:
+            print(f"import time budget of {args.import_time_budget} ms exceeded")
+            failed = True
+
+    results.update(bench_corpora(size=args.size, repeat=args.repeat, only=args.names))
+    # an older source directory may not have the advisories and stream decoding
+    if hasattr(pip_requirements_parser, "AdvisoryDatabase"):
+        results.update(bench_advisories(count=args.advisories, repeat=args.repeat, only=args.names))
+    if hasattr(pip_requirements_parser, "decode_stream"):
+        results.update(bench_decode(megabytes=args.decode_size, repeat=args.repeat, only=args.names))
+
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(
+                dict(
+                    commit=get_commit(),
+                    python=platform.python_version(),
+                    platform=platform.platform(),
+                    size=args.size,
+                    results=results,
+                ),
+                out,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as inp:
+            baseline = json.load(inp)
+        if compare(results, baseline, threshold=args.threshold):
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_benchmarks()
@@ -0,0 +1,132 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import random
+import zipfile
+
+from pip_requirements_parser import AdvisoryDatabase
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import get_version_range
+
+from pip_requirements_parser_tests.lib import requirements_file
+
+ADVISORIES = [
+    {
+        "id": "PYSEC-1",
+        "affected": [{
+            "package": {"ecosystem": "PyPI", "name": "PyYAML"},
+            "ranges": [{"type": "ECOSYSTEM", "events": [
+                {"introduced": "0"}, {"fixed": "5.1"},
+                {"introduced": "5.2"}, {"last_affected": "5.3.1"},
+            ]}],
+        }],
+    },
+    {
+        "id": "PYSEC-2",
+        "affected": [
+            {
+                "package": {"ecosystem": "PyPI", "name": "pyyaml"},
+                "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "5.3"}]}],
+            },
+            {
+                "package": {"ecosystem": "npm", "name": "django"},
+                "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "0"}]}],
+            },
+        ],
+    },
+    {
+        "id": "PYSEC-3",
+        "affected": [{
+            "package": {"ecosystem": "PyPI", "name": "django"},
+            "versions": ["3.2", "3.2.1", "not a version"],
+            "ranges": [{"type": "GIT", "events": [{"introduced": "abcd"}]}],
+        }],
+    },
+]
+
+
+def test_AdvisoryDatabase_get_advisory_ids():
+    db = AdvisoryDatabase()
+    for advisory in ADVISORIES:
+        db.add(advisory)
+    assert len(db) == 3
+
+    assert db.get_advisory_ids("pyyaml", "4.0") == ["PYSEC-1"]
+    assert db.get_advisory_ids("pyyaml", "5.1") == []
+    assert db.get_advisory_ids("pyyaml", "5.2") == ["PYSEC-1"]
+    assert db.get_advisory_ids("pyyaml", "5.3") == ["PYSEC-1", "PYSEC-2"]
+    assert db.get_advisory_ids("pyyaml", "5.3.1") == ["PYSEC-1", "PYSEC-2"]
+    assert db.get_advisory_ids("pyyaml", "6.0") == ["PYSEC-2"]
+    assert db.get_advisory_ids("django", "3.2") == ["PYSEC-3"]
+    assert db.get_advisory_ids("django", "3.2.0") == ["PYSEC-3"]
+    assert db.get_advisory_ids("django", "3.2.2") == []
+    assert db.get_advisory_ids("unknown", "1.0") == []
+
+    assert db.get_advisory_ids_in_range("pyyaml", get_version_range(">=5.1,<5.2")) == []
+    assert db.get_advisory_ids_in_range("pyyaml", get_version_range(">5.1,<5.3")) == ["PYSEC-1"]
+    assert db.get_advisory_ids_in_range("django", get_version_range(">3.2,<3.2.1")) == []
+    assert db.get_advisory_ids_in_range("django", get_version_range(">3.2,<=3.2.1")) == ["PYSEC-3"]
+
+
+def test_AdvisoryDatabase_matches_brute_force_on_random_intervals():
+    rnd = random.Random(42)
+    versions = [f"1.{i}" for i in range(30)]
+    advisories = []
+    for i in range(200):
+        lower, upper = sorted(rnd.sample(range(30), 2))
+        end = rnd.choice(["fixed", "last_affected"])
+        advisories.append({
+            "id": f"ADV-{i:03d}",
+            "affected": [{
+                "package": {"ecosystem": "PyPI", "name": "foo"},
+                "ranges": [{"type": "ECOSYSTEM", "events": [
+                    {"introduced": versions[lower]}, {end: versions[upper]},
+                ]}],
+            }],
+        })
+    db = AdvisoryDatabase()
+    for advisory in advisories:
+        db.add(advisory)
+
+    for position, version in enumerate(versions):
+        expected = []
+        for advisory in advisories:
+            events = advisory["affected"][0]["ranges"][0]["events"]
+            lower = versions.index(events[0]["introduced"])
+            end, upper = list(events[1].items())[0]
+            upper = versions.index(upper)
+            if lower <= position < upper or (end == "last_affected" and position == upper):
+                expected.append(advisory["id"])
+        assert db.get_advisory_ids("foo", version) == expected
+
+
+def test_AdvisoryDatabase_load_and_match(tmpdir):
+    directory = str(tmpdir / "osv")
+    os.makedirs(directory)
+    for advisory in ADVISORIES:
+        with open(os.path.join(directory, advisory["id"] + ".json"), "w") as out:
+            json.dump(advisory, out)
+    archive = str(tmpdir / "all.zip")
+    with zipfile.ZipFile(archive, "w") as zf:
+        for advisory in ADVISORIES:
+            zf.writestr(advisory["id"] + ".json", json.dumps(advisory))
+    single = str(tmpdir / "all.json")
+    with open(single, "w") as out:
+        json.dump(ADVISORIES, out)
+
+    content = "pyyaml==5.3.1\npyyaml==5.1\nDjango>=3.0,<3.2.1\ndjango==3.1.*\nsix\n"
+    with requirements_file(content, tmpdir) as reqs:
+        rf = RequirementsFile.from_file(str(reqs))
+
+    for location in [directory, archive, single]:
+        db = AdvisoryDatabase.load(location)
+        matches = [(m.requirement.line_number, m.advisory_ids, m.is_pinned) for m in db.match([rf])]
+        assert matches == [
+            (1, ["PYSEC-1", "PYSEC-2"], True),
+            (3, ["PYSEC-3"], False),
+        ]
+        pinned = db.match([rf], pinned_only=True)
+        assert [m.to_dict()["advisory_ids"] for m in pinned] == [["PYSEC-1", "PYSEC-2"]]
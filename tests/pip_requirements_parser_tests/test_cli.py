@@ -0,0 +1,129 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+
+import pytest
+
+from pip_requirements_parser import main
+
+
+def write(location, content):
+    with open(location, "w") as out:
+        out.write(content)
+    return location
+
+
+@pytest.fixture
+def reqs(tmpdir):
+    root = str(tmpdir)
+    write(os.path.join(root, "requirements.txt"), "Django == 3.2\n-r nested.txt\n")
+    write(os.path.join(root, "nested.txt"), "foo==\n")
+    return root
+
+
+def test_main_parse(reqs, capsys):
+    filename = os.path.join(reqs, "requirements.txt")
+    assert main(["parse", filename]) == 0
+    out = capsys.readouterr().out
+    assert out == f"{filename}: 1 requirements, 1 options, 0 invalid lines\n"
+
+
+def test_main_parse_directory_with_jobs(reqs, capsys):
+    assert main(["parse", "--jobs", "2", reqs]) == 0
+    out = capsys.readouterr().out
+    assert out.count("\n") == 1
+    assert "requirements.txt" in out
+
+
+def test_main_validate(reqs, capsys):
+    filename = os.path.join(reqs, "*.txt")
+    assert main(["validate", filename]) == 1
+    out = capsys.readouterr().out
+    nested = os.path.join(reqs, "nested.txt")
+    assert out.startswith(f"{nested}:1: Invalid requirement")
+
+    filename = os.path.join(reqs, "requirements.txt")
+    assert main(["validate", filename]) == 0
+    assert main(["validate", "--include-nested", filename]) == 1
+
+
+def test_main_dumps(reqs, capsys, tmpdir):
+    filename = os.path.join(reqs, "requirements.txt")
+    cache_dir = str(tmpdir / "cache")
+
+    assert main(["dumps", "--check", "--cache-dir", cache_dir, filename]) == 1
+    assert capsys.readouterr().out == f"would reformat {filename}\n"
+
+    assert main(["dumps", "--cache-dir", cache_dir, filename]) == 0
+    assert capsys.readouterr().out == f"reformatted {filename}\n"
+    with open(filename) as inp:
+        assert inp.read() == "Django==3.2\n--requirement nested.txt\n"
+
+    assert main(["dumps", "--check", "--cache-dir", cache_dir, filename]) == 0
+    assert os.path.exists(os.path.join(cache_dir, "index.json"))
+
+
+def test_main_dumps_keeps_bom_and_declared_encoding(tmpdir, capsys):
+    utf16 = str(tmpdir / "requirements.txt")
+    with open(utf16, "wb") as out:
+        out.write("Django == 3.2\r\n".encode("utf-16"))
+    latin1 = str(tmpdir / "requirements-latin1.txt")
+    with open(latin1, "wb") as out:
+        out.write("# -*- coding: latin-1 -*-\n# caf\xe9\nfoo == 1.0\n".encode("latin-1"))
+
+    assert main(["dumps", "--check", utf16, latin1]) == 1
+    assert main(["dumps", utf16, latin1]) == 0
+    with open(utf16, "rb") as inp:
+        assert inp.read() == "Django==3.2\r\n".encode("utf-16")
+    with open(latin1, "rb") as inp:
+        assert inp.read() == "# -*- coding: latin-1 -*-\n# caf\xe9\nfoo==1.0\n".encode("latin-1")
+    assert main(["dumps", "--check", utf16, latin1]) == 0
+    # no temporary file is left behind
+    assert sorted(os.listdir(str(tmpdir))) == ["requirements-latin1.txt", "requirements.txt"]
+
+
+def test_main_dumps_with_undecodable_file(tmpdir, capsys, monkeypatch):
+    import pip_requirements_parser
+
+    monkeypatch.setattr(pip_requirements_parser, "get_fallback_encoding", lambda: "utf-8")
+    filename = str(tmpdir / "requirements.txt")
+    with open(filename, "wb") as out:
+        out.write("caf\xe9==1.0\n".encode("latin-1"))
+    assert main(["dumps", filename]) == 2
+    assert filename in capsys.readouterr().err
+    with open(filename, "rb") as inp:
+        assert inp.read() == "caf\xe9==1.0\n".encode("latin-1")
+
+
+def test_main_json(reqs, capsys):
+    filename = os.path.join(reqs, "requirements.txt")
+    assert main(["json", filename]) == 0
+    results = json.loads(capsys.readouterr().out)
+    assert [r["filename"] for r in results] == [filename]
+    assert results[0]["requirements"][0]["name"] == "Django"
+
+
+def test_main_with_missing_file(reqs, capsys):
+    filename = os.path.join(reqs, "missing.txt")
+    assert main(["parse", filename]) == 2
+    assert "cannot read file" in capsys.readouterr().err
+
+
+def test_main_with_unmatched_glob_and_directory(reqs, capsys, tmpdir):
+    pattern = os.path.join(reqs, "*.txtt")
+    empty = str(tmpdir / "empty")
+    os.makedirs(empty)
+    assert main(["validate", pattern, empty]) == 2
+    err = capsys.readouterr().err
+    assert f"{pattern}: error: no requirements files matched" in err
+    assert f"{empty}: error: no requirements files matched" in err
+
+    # the matched files are still processed
+    filename = os.path.join(reqs, "requirements.txt")
+    assert main(["parse", pattern, filename]) == 2
+    captured = capsys.readouterr()
+    assert captured.out == f"{filename}: 1 requirements, 1 options, 0 invalid lines\n"
+    assert pattern in captured.err
@@ -0,0 +1,63 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import textwrap
+
+from pip_requirements_parser import DictionaryColumn
+from pip_requirements_parser import RequirementsBatch
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import iter_requirements_batches
+
+from pip_requirements_parser_tests.lib import requirements_file
+
+
+def test_DictionaryColumn_encodes_unique_values():
+    column = DictionaryColumn()
+    for value in ["a", None, "b", "a", "a"]:
+        column.append(value)
+    assert column.indices.tolist() == [0, -1, 1, 0, 0]
+    assert column.dictionary == ["a", "b"]
+    assert column.to_list() == ["a", None, "b", "a", "a"]
+
+
+def test_iter_requirements_batches(tmpdir):
+    content = textwrap.dedent("""\
+        django==3.2 --hash=sha256:aaaa --hash=sha256:bbbb
+        attrs>=20,<22; python_version>"3.6"
+        -e git+https://github.com/foo/bar.git#egg=bar
+        foo==
+    """)
+    with requirements_file(content, tmpdir) as reqs:
+        rf = RequirementsFile.from_file(str(reqs))
+        batches = list(iter_requirements_batches([rf, rf]))
+
+    assert len(batches) == 1
+    batch = batches[0]
+    assert len(batch) == 8
+    assert batch["line_number"].typecode == "i"
+    assert batch["is_editable"].typecode == "b"
+    # strings are stored once per batch
+    assert batch["filename"].dictionary == [str(reqs)]
+
+    data = batch.to_pydict()
+    assert list(data) == list(RequirementsBatch.column_names)
+    assert data["line_number"][:4] == [1, 2, 3, 4]
+    assert data["name"][:4] == ["django", "attrs", "bar", None]
+    assert data["specifier"][:4] == ["==3.2", ">=20,<22", None, None]
+    assert data["pinned_version"][:4] == ["3.2", None, None, None]
+    assert data["marker"][:4] == [None, 'python_version > "3.6"', None, None]
+    assert data["is_editable"][:4] == [False, False, True, False]
+    assert data["is_constraint"][:4] == [False, False, False, False]
+    assert data["hash_count"][:4] == [2, 0, 0, 0]
+    assert data["error_message"][:3] == [None, None, None]
+    assert data["error_message"][3].startswith("Invalid requirement")
+
+
+def test_iter_requirements_batches_with_batch_size(tmpdir):
+    with requirements_file("a\nb\nc\n", tmpdir) as reqs:
+        rf = RequirementsFile.from_file(str(reqs))
+        batches = list(iter_requirements_batches([rf], batch_size=2))
+
+    assert [len(b) for b in batches] == [2, 1]
+    assert batches[1].to_pydict()["name"] == ["c"]
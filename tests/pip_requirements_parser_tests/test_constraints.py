@@ -0,0 +1,82 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import os
+
+from pip_requirements_parser import ConstraintIndex
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import apply_constraints
+
+
+def write(location, content):
+    with open(location, "w") as out:
+        out.write(content)
+    return location
+
+
+def test_apply_constraints_from_nested_constraints_file(tmpdir):
+    root = str(tmpdir)
+    write(os.path.join(root, "constraints.txt"), (
+        "Django<3.2\n"
+        "attrs==21.1\n"
+        "requests[socks]==2.0\n"
+        "six<1.16; python_version < '3'\n"
+    ))
+    reqs = write(os.path.join(root, "requirements.txt"), (
+        "-c constraints.txt\n"
+        "django>=3.0\n"
+        "attrs>=22\n"
+        "requests>=1.0\n"
+        "six\n"
+        "six; python_version < '3'\n"
+        "unconstrained\n"
+    ))
+    rf = RequirementsFile.from_file(reqs, include_nested=True)
+    results = {
+        (r.requirement.name, str(r.requirement.marker or "")): r
+        for r in apply_constraints([rf])
+    }
+    assert len(results) == 6
+
+    django = results["django", ""]
+    assert [c.name for c in django.constraints] == ["Django"]
+    assert django.to_dict()["specifier"] == [">=3.0", "<3.2"]
+    assert str(django.version_range) == "[3.0, 3.2)"
+    assert not django.is_contradicted
+
+    attrs = results["attrs", ""]
+    assert attrs.is_contradicted
+    assert attrs.to_dict()["is_contradicted"] is True
+
+    # constraint extras are not requested by the requirement
+    assert results["requests", ""].constraints == []
+
+    # constraint markers apply to requirements with the same marker only
+    assert results["six", ""].constraints == []
+    six_py2 = results["six", 'python_version < "3"']
+    assert [str(c.specifier) for c in six_py2.constraints] == ["<1.16"]
+
+    assert results["unconstrained", ""].constraints == []
+
+
+def test_apply_constraints_with_constraints_files_and_environment(tmpdir):
+    root = str(tmpdir)
+    constraints = RequirementsFile.from_file(write(
+        os.path.join(root, "constraints.txt"),
+        "six<1.16; python_version < '3'\nattrs<21\n",
+    ))
+    rf = RequirementsFile.from_file(write(
+        os.path.join(root, "requirements.txt"),
+        "six\nattrs\n",
+    ))
+
+    py2 = apply_constraints([rf], [constraints], environment={"python_version": "2.7"})
+    assert [len(r.constraints) for r in py2] == [1, 1]
+
+    py3 = apply_constraints([rf], [constraints], environment={"python_version": "3.9"})
+    assert [len(r.constraints) for r in py3] == [0, 1]
+
+    index = ConstraintIndex(constraints.requirements)
+    assert len(index) == 2
+    assert index.get_constraints(rf.requirements[0]) == []
@@ -0,0 +1,95 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import os
+
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import diff_requirements_files
+from pip_requirements_parser import diff_requirements_files_many
+
+OLD = """\
+# pinned
+--index-url https://example.com/simple
+django==3.2 --hash=sha256:aaaa
+attrs>=21
+six
+requests[socks]==2.0
+requests==2.0
+-e ./local
+foo; python_version < "3"
+removed==1.0
+"""
+
+NEW = """\
+--index-url https://example.org/simple
+Django==4.0 --hash=sha256:aaaa
+attrs>=21 \\
+    --hash=sha256:bbbb
+requests[socks]==2.0 --global-option="--no-user-cfg"
+requests==2.0
+-e ./local
+foo; python_version < "3"
+six  # moved to the end
+added
+"""
+
+
+def get_changes(diff):
+    return [(rd.name, rd.changes) for rd in diff.requirements]
+
+
+def test_diff_requirements_files():
+    old = RequirementsFile.from_string(OLD)
+    new = RequirementsFile.from_string(NEW)
+    diff = diff_requirements_files(old, new)
+    assert diff.has_changes
+    assert get_changes(diff) == [
+        ("Django", ("version_changed",)),
+        ("attrs", ("hashes_changed",)),
+        ("requests", ("options_changed",)),
+        ("six", ("moved",)),
+        ("added", ("added",)),
+        ("removed", ("removed",)),
+    ]
+    assert [o.dumps() for o in diff.added_options] == ["--index-url https://example.org/simple"]
+    assert [o.dumps() for o in diff.removed_options] == ["--index-url https://example.com/simple"]
+
+    django = diff.to_dict()["requirements"][0]
+    assert django["old"] == "django==3.2 \\\n    --hash=sha256:aaaa"
+    assert django["new_requirement_line"] == {"line_number": 2, "line": "Django==4.0 --hash=sha256:aaaa"}
+
+
+def test_diff_requirements_files_ignores_comments_whitespace_and_specifier_order():
+    old = RequirementsFile.from_string("# comment\nfoo>=1,<2\n\nbar[b,a]\n")
+    new = RequirementsFile.from_string("foo <2, >=1 \\\n  # other\nbar[a,b]  # trailing\n")
+    assert not diff_requirements_files(old, new).has_changes
+
+
+def test_diff_requirements_files_many(tmpdir):
+    root = str(tmpdir)
+    pairs = []
+    for i in range(4):
+        old = os.path.join(root, f"old-{i}.txt")
+        new = os.path.join(root, f"new-{i}.txt")
+        with open(old, "w") as out:
+            out.write(f"foo=={i}\nbar\n")
+        with open(new, "w") as out:
+            out.write(f"bar\nfoo=={i + 1}\n")
+        pairs.append((old, new))
+    pairs.append((None, pairs[0][1]))
+    pairs.append((pairs[0][0], None))
+
+    diffs = diff_requirements_files_many(pairs)
+    assert [get_changes(d) for d in diffs] == [
+        [("bar", ("moved",)), ("foo", ("version_changed",))],
+    ] * 4 + [
+        [("bar", ("added",)), ("foo", ("added",))],
+        [("foo", ("removed",)), ("bar", ("removed",))],
+    ]
+    assert diffs[4].old_filename is None
+
+    parallel = diff_requirements_files_many(pairs, jobs=2)
+    assert [d.to_dict(include_filename=True) for d in parallel] == [
+        d.to_dict(include_filename=True) for d in diffs
+    ]
@@ -0,0 +1,116 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import codecs
+import os
+
+import pytest
+
+from pip_requirements_parser import InstallationError
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import RequirementsFileEditor
+
+LOCK_FILE = """\
+# pinned with hashes
+django==3.2 \\
+    --hash=sha256:aaaa \\
+    --hash=sha256:bbbb \\
+    --hash=sha256:cccc
+    # via -r requirements.in
+Attrs[tests] >= 21.1, <22 ; python_version > "3"  # testing
+six==1.16 --hash=sha256:dddd --hash=sha256:eeee
+https://example.com/foo-1.0.tar.gz#egg=foo
+"""
+
+
+def get_editor(text):
+    return RequirementsFile.from_string(text), RequirementsFileEditor(text)
+
+
+def reparse(editor):
+    return RequirementsFile.from_string(editor.dumps()).requirements
+
+
+def test_RequirementsFileEditor_set_specifier_keeps_other_bytes():
+    rf, editor = get_editor(LOCK_FILE)
+    django, attrs, six, foo = rf.requirements
+    editor.bump_version(django, "4.0")
+    editor.set_specifier(attrs, ">=22")
+
+    patches = [p.to_dict() for p in editor.get_patches()]
+    assert patches == [
+        dict(line_number=2, old_lines=["django==3.2 \\\n"], new_lines=["django==4.0 \\\n"]),
+        dict(
+            line_number=7,
+            old_lines=['Attrs[tests] >= 21.1, <22 ; python_version > "3"  # testing\n'],
+            new_lines=['Attrs[tests] >=22 ; python_version > "3"  # testing\n'],
+        ),
+    ]
+    assert [r.dumps_specifier() for r in reparse(editor)[:2]] == ["==4.0", ">=22"]
+
+    with pytest.raises(InstallationError):
+        editor.bump_version(foo, "2.0")
+    with pytest.raises(InstallationError):
+        editor.set_specifier(six, "not a specifier")
+
+
+def test_RequirementsFileEditor_remove_and_add_hashes():
+    rf, editor = get_editor(LOCK_FILE)
+    django, attrs, six, _foo = rf.requirements
+
+    editor.remove_hashes(django, ["sha256:bbbb"])
+    editor.remove_hashes(django, ["sha256:cccc"])
+    editor.add_hashes(django, ["sha256:aaaa", "sha256:ffff"])
+    editor.add_hashes(attrs, ["sha256:1111", "sha256:2222"])
+    editor.remove_hashes(six, ["sha256:dddd"])
+    editor.add_hashes(six, ["sha256:3333"])
+
+    assert editor.dumps() == (
+        "# pinned with hashes\n"
+        "django==3.2 \\\n"
+        "    --hash=sha256:aaaa \\\n"
+        "    --hash=sha256:ffff\n"
+        "    # via -r requirements.in\n"
+        'Attrs[tests] >= 21.1, <22 ; python_version > "3" \\\n'
+        "    --hash=sha256:1111 \\\n"
+        "    --hash=sha256:2222  # testing\n"
+        "six==1.16 --hash=sha256:eeee --hash=sha256:3333\n"
+        "https://example.com/foo-1.0.tar.gz#egg=foo\n"
+    )
+    edited = [r.hash_options for r in reparse(editor)]
+    assert edited == [
+        ["sha256:aaaa", "sha256:ffff"],
+        ["sha256:1111", "sha256:2222"],
+        ["sha256:eeee", "sha256:3333"],
+        [],
+    ]
+
+    # the requirements to edit are always from the original text
+    editor.remove_hashes(django)
+    editor.remove_hashes(attrs)
+    assert editor.get_hash_options(django) == []
+    assert [r.hash_options for r in reparse(editor)][:2] == [[], []]
+    assert editor.dumps().startswith(
+        "# pinned with hashes\n"
+        "django==3.2\n"
+        "    # via -r requirements.in\n"
+        'Attrs[tests] >= 21.1, <22 ; python_version > "3"  # testing\n'
+    )
+
+
+def test_RequirementsFileEditor_from_file_and_save_keep_encoding_and_line_endings(tmpdir):
+    location = str(tmpdir / "requirements.txt")
+    text = "# café\r\ndjango==3.2\r\nattrs\r\n"
+    with open(location, "wb") as out:
+        out.write(codecs.BOM_UTF16_BE + text.encode("utf-16-be"))
+
+    rf = RequirementsFile.from_file(location)
+    editor = RequirementsFileEditor.from_file(location)
+    editor.bump_version(rf.requirements[0], "4.0")
+    editor.save()
+
+    with open(location, "rb") as inp:
+        data = inp.read()
+    assert data == codecs.BOM_UTF16_BE + text.replace("3.2", "4.0").encode("utf-16-be")
+    assert not [name for name in os.listdir(str(tmpdir)) if ".tmp-" in name]
@@ -0,0 +1,185 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import os
+import textwrap
+
+import pip_requirements_parser
+
+from pip_requirements_parser import DigestCache
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import compact_hash
+from pip_requirements_parser import render_hash
+from pip_requirements_parser import verify_hashes
+
+from pip_requirements_parser_tests.lib import requirements_file
+
+SHA256 = "sha256:" + "0123456789abcdef" * 4
+MD5 = "md5:" + "ab" * 16
+
+
+def test_compact_hash_round_trips_valid_and_invalid_hashes():
+    for hash_option in [
+        SHA256,
+        MD5,
+        "sha512:" + "f" * 128,
+        # wrong length
+        "sha256:abcd",
+        # uppercase hex is kept as-is to render it unchanged
+        "sha256:" + "A" * 64,
+        # not hex
+        "sha256:" + "z" * 64,
+        # unsupported name
+        "blake2b:" + "a" * 128,
+        "no-separator",
+    ]:
+        compact = compact_hash(hash_option)
+        assert render_hash(compact) == hash_option
+
+    assert compact_hash(SHA256) == b"\x03" + bytes.fromhex(SHA256[7:])
+    assert compact_hash("sha256:abcd") == "sha256:abcd"
+
+
+def test_InstallRequirement_stores_deduplicated_compact_hashes(tmpdir):
+    content = textwrap.dedent(f"""\
+        django==3.2 \\
+            --hash={SHA256} \\
+            --hash={MD5} \\
+            --hash={SHA256} \\
+            --hash=sha256:short
+    """)
+    with requirements_file(content, tmpdir) as reqs:
+        rf = RequirementsFile.from_file(str(reqs))
+
+    req = rf.requirements[0]
+    assert req.hashes == (compact_hash(SHA256), compact_hash(MD5), "sha256:short")
+    assert req.hash_options == [SHA256, MD5, "sha256:short"]
+    assert req.invalid_hash_options == ["sha256:short"]
+    assert req.get_hashes() == {
+        "sha256": [bytes.fromhex(SHA256[7:])],
+        "md5": [bytes.fromhex(MD5[4:])],
+    }
+    assert f"--hash={SHA256}" in rf.dumps()
+
+    req.hash_options = [MD5]
+    assert req.hash_options == [MD5]
+
+
+def test_InstallRequirement_hash_options_changed_in_place(tmpdir):
+    with requirements_file(f"django==3.2 --hash={SHA256}\n", tmpdir) as reqs:
+        rf = RequirementsFile.from_file(str(reqs))
+    req = rf.requirements[0]
+    assert rf.dumps() == f"django==3.2 \\\n    --hash={SHA256}\n"
+
+    hash_options = req.hash_options
+    hash_options.append(MD5)
+    hash_options.append(SHA256)
+    assert hash_options == [SHA256, MD5]
+    assert req.hashes == (compact_hash(SHA256), compact_hash(MD5))
+    assert rf.dumps() == f"django==3.2 \\\n    --hash={SHA256} \\\n    --hash={MD5}\n"
+
+    req.hash_options.remove(SHA256)
+    assert req.hash_options == [MD5]
+    req.hash_options.extend(["sha256:short"])
+    del req.hash_options[0]
+    assert req.hashes == ("sha256:short",)
+    req.hash_options.clear()
+    assert req.hashes == ()
+    assert rf.dumps() == "django==3.2\n"
+
+    # copies are not tied to the requirement
+    copied = list(req.hash_options)
+    copied.append(MD5)
+    assert req.hash_options == []
+    assert type(req.to_dict()["hash_options"]) is list
+
+
+def make_wheelhouse(root):
+    """
+    Return a tuple of (requirements file path, {artifact name: sha256 hex}).
+    """
+    wheelhouse = os.path.join(root, "wheelhouse")
+    os.makedirs(wheelhouse)
+    digests = {}
+    for name in [
+        "Django-3.2-py3-none-any.whl",
+        "django-3.2.tar.gz",
+        "django-4.0.tar.gz",
+        "attrs-21.1.0.tar.gz",
+        "six-1.16.0.tar.gz",
+        "local_pkg-1.0.zip",
+        "README.txt",
+    ]:
+        content = name.encode("utf-8") * 1000
+        with open(os.path.join(wheelhouse, name), "wb") as out:
+            out.write(content)
+        digests[name] = hashlib.sha256(content).hexdigest()
+
+    reqs = os.path.join(root, "requirements.txt")
+    with open(reqs, "w") as out:
+        out.write(textwrap.dedent(f"""\
+            django==3.2 \\
+                --hash=sha256:{digests["Django-3.2-py3-none-any.whl"]} \\
+                --hash=sha256:{digests["django-3.2.tar.gz"]}
+            attrs==21.1.0 --hash=sha256:{"0" * 64}
+            pytest==7.0 --hash=sha256:{"1" * 64}
+            six
+            ./local_pkg-1.0.zip --hash=sha256:{digests["local_pkg-1.0.zip"]}
+            -e git+https://github.com/foo/bar.git#egg=bar
+        """))
+    return reqs, wheelhouse, digests
+
+
+def get_statuses(checks):
+    return [
+        (check.requirement.name, check.artifact and os.path.basename(check.artifact), check.status)
+        for check in checks
+    ]
+
+
+def test_verify_hashes(tmpdir):
+    reqs, wheelhouse, digests = make_wheelhouse(str(tmpdir))
+    rf = RequirementsFile.from_file(reqs)
+    checks = verify_hashes(rf, wheelhouse)
+    assert get_statuses(checks) == [
+        ("django", "Django-3.2-py3-none-any.whl", "ok"),
+        ("django", "django-3.2.tar.gz", "ok"),
+        ("attrs", "attrs-21.1.0.tar.gz", "mismatch"),
+        ("pytest", None, "missing_artifact"),
+        ("six", "six-1.16.0.tar.gz", "missing_hashes"),
+        (None, "local_pkg-1.0.zip", "ok"),
+    ]
+    assert checks[2].digests == {"sha256": digests["attrs-21.1.0.tar.gz"]}
+    assert checks[4].to_dict()["digests"] == {"sha256": digests["six-1.16.0.tar.gz"]}
+
+    parallel = verify_hashes(rf, wheelhouse, jobs=2)
+    assert get_statuses(parallel) == get_statuses(checks)
+
+
+def test_verify_hashes_uses_digest_cache(tmpdir, monkeypatch):
+    reqs, wheelhouse, _digests = make_wheelhouse(str(tmpdir))
+    rf = RequirementsFile.from_file(reqs)
+    cache_location = str(tmpdir / "digests.json")
+    expected = get_statuses(verify_hashes(rf, wheelhouse, digest_cache=DigestCache(cache_location)))
+
+    hashed = []
+    hash_file = pip_requirements_parser._hash_file
+
+    def counting_hash_file(filename, names):
+        hashed.append(os.path.basename(filename))
+        return hash_file(filename, names)
+
+    monkeypatch.setattr(pip_requirements_parser, "_hash_file", counting_hash_file)
+
+    cache = DigestCache(cache_location)
+    assert len(cache) == 5
+    assert get_statuses(verify_hashes(rf, wheelhouse, digest_cache=cache)) == expected
+    assert hashed == []
+
+    attrs = os.path.join(wheelhouse, "attrs-21.1.0.tar.gz")
+    with open(attrs, "ab") as out:
+        out.write(b"more")
+    verify_hashes(rf, wheelhouse, digest_cache=DigestCache(cache_location))
+    assert hashed == ["attrs-21.1.0.tar.gz"]
@@ -0,0 +1,106 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pip_requirements_parser
+
+
+DEFERRED_MODULES = [
+    "array",
+    "concurrent.futures",
+    "hashlib",
+    "json",
+    "locale",
+    "optparse",
+    "shlex",
+    "shutil",
+    "tempfile",
+    "urllib.request",
+    "zlib",
+    "packaging.markers",
+    "packaging.requirements",
+    "packaging.specifiers",
+    "packaging.tags",
+]
+
+
+def get_modules_imported_by(code):
+    """
+    Return the set of the DEFERRED_MODULES imported when running ``code`` in a
+    new Python process.
+    """
+    check = (
+        f"import sys; {code}; import json; "
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    )
+    env = dict(os.environ)
+    src_dir = os.path.dirname(pip_requirements_parser.__file__)
+    env["PYTHONPATH"] = os.pathsep.join([src_dir, env.get("PYTHONPATH", "")])
+    output = subprocess.check_output([sys.executable, "-c", check], env=env)
+    return set(json.loads(output))
+
+
+def test_import_does_not_import_deferred_modules():
+    baseline = get_modules_imported_by("pass")
+    imported = get_modules_imported_by("import pip_requirements_parser")
+    assert imported - baseline == set()
+
+
+def test_parsing_imports_deferred_modules_when_needed(tmpdir):
+    reqs = tmpdir / "reqs.txt"
+    reqs.write_text("django==3.2; python_version > '3.6'\n")
+    imported = get_modules_imported_by(
+        "import pip_requirements_parser as p; "
+        f"p.RequirementsFile.from_file({str(reqs)!r})"
+    )
+    assert {"optparse", "shlex", "packaging.requirements"} <= imported
+
+
+@pytest.mark.parametrize("options, dests", [
+    (pip_requirements_parser.LEGACY_OPTIONS, pip_requirements_parser.LEGACY_OPTIONS_DEST),
+    (pip_requirements_parser.SUPPORTED_OPTIONS, pip_requirements_parser.SUPPORTED_OPTIONS_DEST),
+    (pip_requirements_parser.SUPPORTED_OPTIONS_REQ, pip_requirements_parser.SUPPORTED_OPTIONS_REQ_DEST),
+])
+def test_precomputed_options_dest_are_in_sync(options, dests):
+    assert [str(o().dest) for o in options] == dests
+
+
+def test_precomputed_opt_by_options_dest_is_in_sync():
+    options = (
+        pip_requirements_parser.SUPPORTED_OPTIONS
+        + pip_requirements_parser.SUPPORTED_OPTIONS_REQ
+        + pip_requirements_parser.LEGACY_OPTIONS
+    )
+    expected = {str(o().dest): o().get_opt_string() for o in options}
+    assert pip_requirements_parser.OPT_BY_OPTIONS_DEST == expected
+
+
+def test_deferred_names_are_importable_on_access():
+    assert get_modules_imported_by(
+        "from pip_requirements_parser import RequirementsFile"
+    ) - get_modules_imported_by("pass") == set()
+
+    import optparse
+
+    from packaging.markers import Marker
+    from packaging.requirements import Requirement
+    from packaging.specifiers import Specifier
+    from packaging.specifiers import SpecifierSet
+
+    from pip_requirements_parser import operators
+
+    assert pip_requirements_parser.Requirement is Requirement
+    assert pip_requirements_parser.Marker is Marker
+    assert pip_requirements_parser.SpecifierSet is SpecifierSet
+    assert pip_requirements_parser.Option is optparse.Option
+    assert isinstance(pip_requirements_parser.index_url(), pip_requirements_parser.Option)
+    assert set(operators) == set(Specifier._operators)
+    with pytest.raises(AttributeError):
+        pip_requirements_parser.NoSuchName
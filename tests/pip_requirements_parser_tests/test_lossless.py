@@ -0,0 +1,117 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import random
+
+import pytest
+
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import auto_decode
+from pip_requirements_parser import preprocess
+from pip_requirements_parser import preprocess_lossless
+
+from pip_requirements_parser_tests.lib import ALL_REQFILES
+from pip_requirements_parser_tests.lib import MORE_REQFILES
+from pip_requirements_parser_tests.lib import SC_REQFILES
+from pip_requirements_parser_tests.test_preprocess import FRAGMENTS
+
+all_test_requirements_files = ALL_REQFILES + MORE_REQFILES + SC_REQFILES
+
+
+def get_text(content, span):
+    """
+    Return the text of a ``span`` using only its line and column positions.
+    """
+    lines = content.splitlines(True)[span.start_line - 1:span.end_line]
+    lines[-1] = lines[-1][:span.end_column]
+    lines[0] = lines[0][span.start_column:]
+    return "".join(lines)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_preprocess_lossless_is_like_preprocess(seed):
+    rnd = random.Random(seed)
+    for _ in range(200):
+        content = "".join(rnd.choice(FRAGMENTS) for _ in range(rnd.randint(0, 30)))
+        spanned = list(preprocess_lossless(content))
+        assert [line for line, _ in spanned] == list(preprocess(content)), content
+
+        rebuilt = []
+        previous_raw = None
+        for line, span in spanned:
+            assert get_text(content, span) == span.text, content
+            if span.start_line == span.end_line and "\\" not in span.text:
+                assert span.text == line.line, content
+            if span.raw is not previous_raw:
+                rebuilt.extend([span.prefix, span.raw, span.suffix])
+            previous_raw = span.raw
+        if spanned:
+            assert "".join(rebuilt) == content, content
+
+
+@pytest.mark.parametrize("test_file", all_test_requirements_files)
+def test_RequirementsFile_lossless_dumps_is_identical(test_file):
+    with open(test_file, "rb") as inp:
+        text = auto_decode(inp.read())
+    rf = RequirementsFile.from_file(test_file, lossless=True)
+    assert rf.dumps() == text
+    # the parsed data is not changed by a lossless parse
+    assert rf.to_dict() == RequirementsFile.from_file(test_file).to_dict()
+
+
+@pytest.mark.parametrize("text", ["", "\n", "\r\n\r\n", "  \t", " \n  \n", "\\\n", "\\"])
+def test_RequirementsFile_lossless_dumps_of_empty_lines_only(text):
+    rf = RequirementsFile.from_string(text, lossless=True)
+    assert rf.dumps() == text
+    assert rf.remainder == text
+
+    new = RequirementsFile.from_string("new==1.0").requirements[0]
+    rf.requirements.append(new)
+    separator = "" if text.endswith("\n") or not text else "\n"
+    assert rf.dumps() == f"{text}{separator}new==1.0\n"
+
+
+def test_RequirementsFile_lossless_dumps_of_changed_lines():
+    text = (
+        "# header\r\n"
+        "\r\n"
+        "django==3.2 \\\r\n"
+        "    --hash=sha256:aaaa  # pinned\r\n"
+        "attrs  >= 21   # trailing\r\n"
+        "  six==1.16\r\n"
+        "\r\n"
+    )
+    rf = RequirementsFile.from_string(text, lossless=True)
+    django, attrs, six = rf.requirements
+    assert attrs.requirement_line.span.to_dict() == dict(
+        start_line=5, start_column=0, end_line=5, end_column=12, text="attrs  >= 21",
+    )
+
+    django.hash_options = ["sha256:bbbb"]
+    rf.comments = [c for c in rf.comments if c.line != "# trailing"]
+    new = RequirementsFile.from_string("new==1.0").requirements[0]
+    new.requirement_line.line_number = 10
+    rf.requirements.append(new)
+    assert rf.dumps() == (
+        "# header\r\n"
+        "\r\n"
+        "django==3.2 \\\r\n    --hash=sha256:bbbb # pinned\r\n"
+        "attrs>=21\r\n"
+        "  six==1.16\r\n"
+        "\r\n"
+        "new==1.0\n"
+    )
+
+
+def test_RequirementsFile_dumps_many_lossless_keeps_line_endings(tmpdir):
+    location = str(tmpdir / "requirements.txt")
+    text = "foo==1\r\n\r\nbar  # two spaces\r\nbaz"
+    with open(location, "w", newline="") as out:
+        out.write(text)
+
+    rf = RequirementsFile.from_file(location, lossless=True)
+    rf.requirements[0].hash_options = ["sha256:abcd"]
+    RequirementsFile.dumps_many([rf])
+    with open(location, "rb") as inp:
+        assert inp.read() == b"foo==1 \\\r\n    --hash=sha256:abcd\r\n\r\nbar  # two spaces\r\nbaz"
@@ -0,0 +1,119 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import merge_requirements_files
+
+BASE = """\
+# header
+--index-url https://example.com/simple
+django==3.2  # web
+attrs==21.1
+six==1.15
+requests==2.0
+"""
+
+OURS = """\
+# header
+--index-url https://example.com/simple
+django==3.2  # web framework
+attrs==22.1
+requests==2.0
+mine==1.0
+"""
+
+THEIRS = """\
+# header
+--index-url https://example.org/simple
+django==4.0  # web
+attrs==23.1
+six==1.16
+# added by the bot
+newpkg==1.0  # new
+requests==2.0
+"""
+
+
+def test_merge_requirements_files():
+    merged = merge_requirements_files(
+        RequirementsFile.from_string(BASE),
+        RequirementsFile.from_string(OURS),
+        RequirementsFile.from_string(THEIRS),
+    )
+    assert merged.text == (
+        "# header\n"
+        "--index-url https://example.org/simple\n"
+        "django==4.0 # web framework\n"
+        "attrs==22.1\n"
+        "# added by the bot\n"
+        "newpkg==1.0 # new\n"
+        "requests==2.0\n"
+        "mine==1.0\n"
+    )
+
+    assert merged.has_conflicts
+    conflicts = merged.to_dict()["conflicts"]
+    assert [c["name"] for c in conflicts] == ["attrs", "six"]
+    attrs, six = conflicts
+    assert [attrs[v]["line"] for v in ("base", "ours", "theirs")] == [
+        "attrs==21.1", "attrs==22.1", "attrs==23.1",
+    ]
+    # deleted in ours and changed in theirs
+    assert six["ours"] is None
+    assert six["theirs"]["line"] == "six==1.16"
+
+
+def test_merge_requirements_files_same_changes_and_single_valued_options():
+    base = RequirementsFile.from_string("--index-url https://a\nfoo==1\nfoo==1; python_version < '3'\n")
+    ours = RequirementsFile.from_string("--index-url https://b\nFoo==2\nfoo==1; python_version < '3'\n")
+    theirs = RequirementsFile.from_string("--index-url https://c\nfoo==2.0\n")
+    merged = merge_requirements_files(base, ours, theirs)
+    assert merged.text == "--index-url https://b\nFoo==2\n"
+    assert [c.ours.dumps() for c in merged.conflicts] == ["--index-url https://b"]
+
+
+def test_merge_requirements_files_with_missing_files():
+    theirs = RequirementsFile.from_string("# new file\nfoo==1\n")
+    merged = merge_requirements_files(None, None, theirs)
+    assert merged.text == "# new file\nfoo==1\n"
+    assert not merged.conflicts
+
+    merged = merge_requirements_files(theirs, theirs, None)
+    assert merged.text == "# new file\n"
+
+
+def test_merge_requirements_files_keeps_the_text_of_unchanged_lines():
+    base = "-i https://example.com/simple\ndjango==3.2   # web\nattrs==21.1\n"
+    ours = "-i https://example.com/simple\ndjango==3.2   # web\nattrs==22.1\n"
+    theirs = (
+        "-i https://example.com/simple\n"
+        "django==3.2   # web\n"
+        "attrs==21.1\n"
+        "six  >=1.16 \\\n"
+        "    --hash=sha256:abcd  # pinned\n"
+    )
+    merged = merge_requirements_files(
+        RequirementsFile.from_string(base),
+        RequirementsFile.from_string(ours),
+        RequirementsFile.from_string(theirs),
+    )
+    assert merged.text == (
+        "-i https://example.com/simple\n"
+        "django==3.2 # web\n"
+        "attrs==22.1\n"
+        "six>=1.16 \\\n    --hash=sha256:abcd # pinned\n"
+    )
+
+    merged = merge_requirements_files(
+        RequirementsFile.from_string(base, lossless=True),
+        RequirementsFile.from_string(ours, lossless=True),
+        RequirementsFile.from_string(theirs, lossless=True),
+    )
+    assert merged.text == (
+        "-i https://example.com/simple\n"
+        "django==3.2   # web\n"
+        "attrs==22.1\n"
+        "six  >=1.16 \\\n"
+        "    --hash=sha256:abcd  # pinned\n"
+    )
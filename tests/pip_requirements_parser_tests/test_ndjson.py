@@ -0,0 +1,60 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import io
+import json
+
+import pytest
+
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import dump_ndjson
+from pip_requirements_parser import dump_ndjson_many
+
+from pip_requirements_parser_tests.lib import ALL_REQFILES
+
+
+def load_ndjson(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+@pytest.mark.parametrize("test_file", ALL_REQFILES[:10])
+def test_dump_ndjson_has_the_same_items_as_to_dict(test_file):
+    output = io.StringIO()
+    count = dump_ndjson(str(test_file), output)
+    items = load_ndjson(output.getvalue())
+    assert len(items) == count
+
+    expected = RequirementsFile.from_file(str(test_file)).to_dict(include_filename=True)
+    results = dict(requirements=[], options=[], invalid_lines=[], comments=[])
+    key_by_type = dict(
+        requirement="requirements",
+        option="options",
+        invalid_line="invalid_lines",
+        comment="comments",
+    )
+    for item in items:
+        results[key_by_type[item.pop("type")]].append(item)
+    assert results == expected
+
+
+def test_dump_ndjson_many(tmpdir):
+    first = tmpdir / "first.txt"
+    first.write_text("django==3.2 # web\n")
+    second = tmpdir / "second.txt"
+    second.write_text("--index-url https://example.com\n")
+    missing = tmpdir / "missing.txt"
+
+    for jobs in (1, 2):
+        output = io.StringIO()
+        dump_ndjson_many([str(first), str(missing), str(second)], output, jobs=jobs)
+        items = load_ndjson(output.getvalue())
+        # requirements have their filename in their requirement_line
+        filenames = [i.get("filename") or i["requirement_line"]["filename"] for i in items]
+        assert list(zip([i["type"] for i in items], filenames)) == [
+            ("requirement", str(first)),
+            ("comment", str(first)),
+            ("error", str(missing)),
+            ("option", str(second)),
+        ]
+        assert items[2]["error_message"].startswith("Could not open requirements file")
@@ -0,0 +1,103 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import os
+
+import pytest
+
+from pip_requirements_parser import InstallationError
+from pip_requirements_parser import PackageIndex
+from pip_requirements_parser import RequirementsFile
+
+
+def write(location, content):
+    with open(location, "w") as out:
+        out.write(content)
+    return location
+
+
+def make_files(root):
+    return [
+        RequirementsFile.from_file(write(os.path.join(root, "a.txt"), (
+            "PyYAML==5.3.1\n"
+            "django>=3.0\n"
+            "-e git+https://github.com/foo/bar.git#egg=bar\n"
+        ))),
+        RequirementsFile.from_file(write(os.path.join(root, "b.txt"), (
+            "pyyaml==5.4\n"
+            "pyyaml==4.2b1; python_version < '3'\n"
+            "pyyaml<5\n"
+            "django==2.2.1\n"
+        ))),
+    ]
+
+
+def get_lines(postings):
+    return [(os.path.basename(p.filename), p.line_number) for p in postings]
+
+
+def test_PackageIndex_find_pinned_versions_in_range(tmpdir):
+    index = PackageIndex.from_requirements_files(make_files(str(tmpdir)))
+    assert index.names() == ["bar", "django", "pyyaml"]
+    assert get_lines(index.get("pyyaml")) == [("a.txt", 1), ("b.txt", 1), ("b.txt", 2), ("b.txt", 3)]
+    assert index.get("bar")[0].is_editable
+
+    assert get_lines(index.find("pyyaml", "<5.4")) == [("a.txt", 1), ("b.txt", 2)]
+    assert get_lines(index.find("pyyaml", ">=5.3,!=5.3.1")) == [("b.txt", 1)]
+    assert get_lines(index.find("pyyaml", "<4.0")) == []
+    assert get_lines(index.find("pyyaml", "<4.0", pinned_only=False)) == [("b.txt", 3)]
+    assert get_lines(index.find("DJANGO", "")) == [("b.txt", 4)]
+    assert get_lines(index.find("django", "", pinned_only=False)) == [("a.txt", 2), ("b.txt", 4)]
+
+
+def test_PackageIndex_update_replaces_postings_of_a_file(tmpdir):
+    files = make_files(str(tmpdir))
+    index = PackageIndex.from_requirements_files(files)
+
+    changed = RequirementsFile.from_file(write(files[1].filename, "attrs==21.1\n"))
+    index.update(changed)
+    assert index.names() == ["attrs", "bar", "django", "pyyaml"]
+    assert get_lines(index.get("pyyaml")) == [("a.txt", 1)]
+    assert get_lines(index.find("pyyaml", "<5.4")) == [("a.txt", 1)]
+    assert index.sources[changed.filename] == {"attrs"}
+
+    index.remove(files[0].filename)
+    assert index.names() == ["attrs"]
+
+
+def test_PackageIndex_save_and_load_mapped(tmpdir):
+    files = make_files(str(tmpdir))
+    location = str(tmpdir / "index.bin")
+    PackageIndex.from_requirements_files(files).save(location)
+
+    loaded = PackageIndex.load(location)
+    assert loaded.names() == ["bar", "django", "pyyaml"]
+    # postings are only read from the mapped file on access
+    assert loaded._postings == {}
+    assert get_lines(loaded.find("pyyaml", "<5.4")) == [("a.txt", 1), ("b.txt", 2)]
+    assert list(loaded._postings) == ["pyyaml"]
+    assert loaded.get("not-indexed") == []
+
+    # update a loaded index and save it in place
+    changed = RequirementsFile.from_file(write(files[0].filename, "django==3.2\n"))
+    loaded.update(changed)
+    loaded.save(location)
+    loaded.close()
+    assert get_lines(loaded.find("django", "==3.2")) == [("a.txt", 1)]
+
+    reloaded = PackageIndex.load(location)
+    assert reloaded.names() == ["django", "pyyaml"]
+    assert get_lines(reloaded.get("pyyaml")) == [("b.txt", 1), ("b.txt", 2), ("b.txt", 3)]
+    assert get_lines(reloaded.find("django", "")) == [("a.txt", 1), ("b.txt", 4)]
+    assert reloaded.sources == {
+        files[0].filename: {"django"},
+        files[1].filename: {"django", "pyyaml"},
+    }
+    reloaded.close()
+
+
+def test_PackageIndex_load_rejects_other_files(tmpdir):
+    location = write(str(tmpdir / "index.bin"), "not an index")
+    with pytest.raises(InstallationError):
+        PackageIndex.load(location)
@@ -0,0 +1,79 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import random
+
+import pytest
+
+from pip_requirements_parser import CommentLine
+from pip_requirements_parser import TextLine
+from pip_requirements_parser import join_lines
+from pip_requirements_parser import preprocess
+from pip_requirements_parser import split_comments
+
+# fragments mixing continuations, comments, URL fragments, whitespace including
+# unicode whitespace and line breaks recognized by str.splitlines()
+FRAGMENTS = [
+    "django==3.2",
+    "--hash=sha256:abcd",
+    "https://example.com/foo.tar.gz#egg=foo",
+    "#",
+    "# comment",
+    "#no-space",
+    "\\",
+    "\\\\",
+    " ",
+    "  ",
+    "\t",
+    "\u00a0",
+    "\u3000",
+    "\x1f",
+    "\n",
+    "\r\n",
+    "\r",
+    "\x0c",
+    "\u2028",
+    "; python_version < '3'",
+    "-r other.txt",
+    "a",
+]
+
+
+def reference_preprocess(content):
+    lines_enum = enumerate(content.splitlines(), start=1)
+    return list(split_comments(join_lines(lines_enum)))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_preprocess_is_like_join_lines_and_split_comments(seed):
+    rnd = random.Random(seed)
+    for _ in range(200):
+        content = "".join(rnd.choice(FRAGMENTS) for _ in range(rnd.randint(0, 30)))
+        expected = reference_preprocess(content)
+        results = list(preprocess(content))
+        assert results == expected, content
+        assert [type(r) for r in results] == [type(e) for e in expected], content
+
+
+def test_preprocess_keeps_original_line_numbers():
+    content = (
+        "# header\n"
+        "django==3.2 \\\n"
+        "    --hash=sha256:abcd \\\n"
+        "    --hash=sha256:ef01  # hashes\n"
+        "\n"
+        "foo#bar\n"
+        "attrs \\\n"
+        "# comment after a continuation\n"
+        "six \\"
+    )
+    assert list(preprocess(content)) == [
+        CommentLine(1, "# header"),
+        TextLine(2, "django==3.2     --hash=sha256:abcd     --hash=sha256:ef01"),
+        CommentLine(2, "# hashes"),
+        TextLine(6, "foo#bar"),
+        TextLine(7, "attrs"),
+        CommentLine(7, "# comment after a continuation"),
+        TextLine(9, "six"),
+    ]
@@ -0,0 +1,85 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import os
+
+import pip_requirements_parser
+
+from pip_requirements_parser import ParseProfiler
+from pip_requirements_parser import RequirementsFile
+
+
+def make_nested_files(root):
+    base = os.path.join(root, "requirements.txt")
+    with open(base, "w") as out:
+        out.write(
+            "# comment\n"
+            "django==3.2 \\\n"
+            "    --hash=sha256:aaaa\n"
+            "attrs; python_version > '3'\n"
+            "https://example.com/foo-1.0.tar.gz#egg=foo\n"
+            "-r dev.txt\n"
+        )
+    dev = os.path.join(root, "dev.txt")
+    with open(dev, "w") as out:
+        out.write("pytest\n")
+    return base, dev
+
+
+def test_ParseProfiler_records_stages_and_files(tmpdir):
+    base, dev = make_nested_files(str(tmpdir))
+    with ParseProfiler() as profiler:
+        rf = RequirementsFile.from_file(base, include_nested=True)
+    assert len(rf.requirements) == 4
+    assert pip_requirements_parser._profiler is None
+
+    results = profiler.to_dict()
+    counts = {stage: stats["count"] for stage, stats in results["stages"].items()}
+    assert counts == {
+        "read": 2,
+        "decode": 2,
+        "preprocess": 2,
+        "optparse": 5,
+        "requirement": 4,
+        "marker": 1,
+        "link": 1,
+    }
+    assert sorted(results["files"]) == sorted([base, dev])
+    assert all(seconds > 0 for seconds in results["files"].values())
+
+
+def test_ParseProfiler_spans_nest_marker_and_link_in_requirement(tmpdir):
+    base, _dev = make_nested_files(str(tmpdir))
+    with ParseProfiler() as profiler:
+        RequirementsFile.from_file(base)
+
+    spans = profiler.to_spans()
+    by_id = {span["span_id"]: span for span in spans}
+    nested = [span for span in spans if span["parent_span_id"] is not None]
+    assert sorted(span["name"] for span in nested) == ["link", "marker"]
+    for span in nested:
+        parent = by_id[span["parent_span_id"]]
+        assert parent["name"] == "requirement"
+        assert span["attributes"] == {"code.filepath": base}
+        assert parent["start_time_unix_nano"] <= span["start_time_unix_nano"]
+        assert span["end_time_unix_nano"] <= parent["end_time_unix_nano"]
+
+
+def test_ParseProfiler_callback_without_spans(tmpdir):
+    base, _dev = make_nested_files(str(tmpdir))
+    calls = []
+
+    def callback(stage, filename, seconds):
+        calls.append((stage, filename))
+
+    with ParseProfiler(record_spans=False, callback=callback) as profiler:
+        RequirementsFile.from_file(base)
+
+    assert profiler.spans == []
+    assert ("decode", base) in calls
+    assert len(calls) == sum(s["count"] for s in profiler.to_dict()["stages"].values())
+
+    # nothing is recorded once the profiler is exited
+    RequirementsFile.from_file(base)
+    assert len(calls) == sum(s["count"] for s in profiler.to_dict()["stages"].values())
@@ -59,3 +59,126 @@ def test_RequirementsFile_dumps_unparse(
             expected = inp.read()
 
     assert dumped == expected
+
+
+@pytest.mark.parametrize("test_file", all_test_requirements_files)
+@pytest.mark.parametrize("binary", [False, True])
+def test_RequirementsFile_serialize_and_loads_roundtrip(
+    test_file: str,
+    binary: bool,
+) -> None:
+    rf = pip_requirements_parser.RequirementsFile.from_file(test_file)
+    serialized = rf.serialize(binary=binary)
+    assert isinstance(serialized, bytes if binary else str)
+
+    loaded = pip_requirements_parser.RequirementsFile.loads(serialized)
+    assert loaded.dumps() == rf.dumps()
+    assert loaded.to_dict(include_filename=True) == rf.to_dict(include_filename=True)
+    assert loaded.serialize(binary=binary) == serialized
+
+
+def test_RequirementsFile_from_dict_does_not_reparse(monkeypatch) -> None:
+    test_file = str(all_test_requirements_files[0])
+    data = pip_requirements_parser.RequirementsFile.from_file(test_file).to_serializable()
+
+    def fail(*args, **kwargs):
+        raise Exception("should not be called")
+
+    monkeypatch.setattr(pip_requirements_parser, "get_line_parser", fail)
+    monkeypatch.setattr(pip_requirements_parser, "parse_reqparts_from_string", fail)
+    pip_requirements_parser.RequirementsFile.from_dict(data)
+
+
+def test_RequirementsFile_from_dict_rejects_unknown_format_version() -> None:
+    with pytest.raises(pip_requirements_parser.InstallationError):
+        pip_requirements_parser.RequirementsFile.from_dict(dict(format_version=0))
+
+
+@pytest.mark.parametrize("test_file", all_test_requirements_files)
+def test_InstallRequirement_normalized_name_is_packaging_canonical_name(test_file) -> None:
+    from packaging.utils import canonicalize_name
+
+    rf = pip_requirements_parser.RequirementsFile.from_file(str(test_file))
+    for req in rf.requirements:
+        expected = req.name and canonicalize_name(req.name) or None
+        assert req.normalized_name == expected
+
+
+@pytest.mark.parametrize("test_file", all_test_requirements_files)
+def test_RequirementsFile_dumps_merge_is_like_sort(test_file, monkeypatch) -> None:
+    rf = pip_requirements_parser.RequirementsFile.from_file(str(test_file))
+    merged = rf.dumps(preserve_one_empty_line=True)
+    monkeypatch.setattr(
+        pip_requirements_parser, "_is_sorted_by_line_number", lambda items: False
+    )
+    assert rf.dumps(preserve_one_empty_line=True) == merged
+
+
+def test_RequirementsFile_dumps_many(tmpdir) -> None:
+    rfs = [
+        pip_requirements_parser.RequirementsFile.from_file(str(test_file))
+        for test_file in all_test_requirements_files
+    ]
+    output_dir = str(tmpdir / "out")
+    written = pip_requirements_parser.RequirementsFile.dumps_many(
+        rfs, output_dir=output_dir, preserve_one_empty_line=True,
+    )
+    assert len(set(written)) == len(rfs)
+    for rf, location in zip(rfs, written):
+        assert location.startswith(output_dir)
+        with open(location) as inp:
+            assert inp.read() == rf.dumps(preserve_one_empty_line=True)
+
+    # in place
+    rf = pip_requirements_parser.RequirementsFile.from_file(written[0])
+    assert rf.dumps_many([rf]) == [written[0]]
+
+
+def test_InstallRequirement_dumps_is_updated_on_changes() -> None:
+    from packaging.requirements import Requirement
+
+    sha256 = "sha256:" + "ab" * 32
+    rf = pip_requirements_parser.RequirementsFile.from_string(
+        f"django==3.2 --hash={sha256} --hash=sha256:abcd\n"
+        "--index-url https://example.com\n"
+    )
+    req = rf.requirements[0]
+    assert req.dumps() == f"django==3.2 \\\n    --hash={sha256} \\\n    --hash=sha256:abcd"
+    # the rendered hashes are cached until the hashes change
+    assert req.dumps_hashes() is req.dumps_hashes()
+    req.hash_options.remove("sha256:abcd")
+    assert req.dumps() == f"django==3.2 \\\n    --hash={sha256}"
+
+    req.req = Requirement("django==4.0")
+    req.hash_options = []
+    assert req.dumps() == "django==4.0"
+    assert req.dumps(with_name=False) == "==4.0"
+
+    option = rf.options[0]
+    assert option.dumps() == "--index-url https://example.com"
+    option.options = dict(index_url="https://example.org")
+    assert rf.dumps() == "django==4.0\n--index-url https://example.org\n"
+
+    # changes in place
+    req.req.specifier &= "<5"
+    req.extras.add("bcrypt")
+    req.global_options.append("--foo")
+    option.options["index_url"] = "https://example.net"
+    assert rf.dumps() == (
+        "django[bcrypt]==4.0,<5 --global-option=--foo\n"
+        "--index-url https://example.net\n"
+    )
+
+
+def test_RequirementsFile_lossless_dumps_of_lines_changed_in_place() -> None:
+    rf = pip_requirements_parser.RequirementsFile.from_string(
+        "django==3.2  # web\n--find-links  https://example.com\n",
+        lossless=True,
+    )
+    assert rf.dumps() == "django==3.2  # web\n--find-links  https://example.com\n"
+    rf.requirements[0].req.specifier &= "<4"
+    rf.options[0].options["find_links"].append("https://example.org")
+    assert rf.dumps() == (
+        "django==3.2,<4 # web\n"
+        "--find-links https://example.com --find-links https://example.org\n"
+    )
@@ -0,0 +1,110 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import os
+import pathlib
+
+import pytest
+
+from pip_requirements_parser import InstallationError
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import UrlResolver
+
+
+def write(location, text):
+    os.makedirs(os.path.dirname(location), exist_ok=True)
+    with open(location, "w") as out:
+        out.write(text)
+    return pathlib.Path(location).as_uri()
+
+
+def test_UrlResolver_fetch_uses_cache_ttl_and_offline_mode(tmpdir):
+    cache_dir = str(tmpdir / "cache")
+    source = str(tmpdir / "remote" / "requirements.txt")
+    url = write(source, "foo==1.0\n")
+
+    resolver = UrlResolver(cache_dir)
+    assert resolver.fetch(url) == b"foo==1.0\n"
+    os.remove(source)
+    assert resolver.fetch(url) == b"foo==1.0\n"
+
+    # expired and cannot be fetched: the expired content is used
+    assert UrlResolver(cache_dir, ttl=0).fetch(url) == b"foo==1.0\n"
+
+    write(source, "foo==2.0\n")
+    assert UrlResolver(cache_dir, offline=True, ttl=0).fetch(url) == b"foo==1.0\n"
+    assert UrlResolver(cache_dir, ttl=0).fetch(url) == b"foo==2.0\n"
+
+    with pytest.raises(InstallationError):
+        UrlResolver(cache_dir, offline=True).fetch(url + ".missing")
+    with pytest.raises(InstallationError):
+        UrlResolver(cache_dir).fetch(url + ".missing")
+
+
+def test_UrlResolver_parses_and_prefetches_nested_urls(tmpdir):
+    cache_dir = str(tmpdir / "cache")
+    remote = str(tmpdir / "remote")
+    nested_url = write(os.path.join(remote, "base.txt"), "-c constraints.txt\nbar\n")
+    write(os.path.join(remote, "constraints.txt"), "baz==1.0\n")
+    local = str(tmpdir / "requirements.txt")
+    write(local, f"-r {nested_url}\nfoo\n")
+
+    with UrlResolver(cache_dir):
+        rf = RequirementsFile.from_file(local, include_nested=True)
+    assert [r.name for r in rf.requirements] == ["baz", "bar", "foo"]
+
+    cache_dir = str(tmpdir / "other-cache")
+    fetched = UrlResolver(cache_dir).prefetch([local])
+    assert [os.path.basename(url) for url in fetched] == ["base.txt", "constraints.txt"]
+
+    for name in os.listdir(remote):
+        os.remove(os.path.join(remote, name))
+    with UrlResolver(cache_dir, offline=True):
+        offline = RequirementsFile.from_file(local, include_nested=True)
+    assert offline.to_dict() == rf.to_dict()
+
+
+def test_UrlResolver_prefetch_restores_the_active_resolver(tmpdir):
+    import pip_requirements_parser
+
+    local = str(tmpdir / "requirements.txt")
+    write(local, "foo\n")
+    outer = UrlResolver(str(tmpdir / "outer"))
+    inner = UrlResolver(str(tmpdir / "inner"))
+    with outer:
+        inner.prefetch([local])
+        assert pip_requirements_parser._url_resolver is outer
+        with inner:
+            inner.prefetch([local])
+            assert pip_requirements_parser._url_resolver is inner
+        assert pip_requirements_parser._url_resolver is outer
+    assert pip_requirements_parser._url_resolver is None
+
+
+def test_UrlResolver_evicts_least_recently_used_contents(tmpdir):
+    cache_dir = str(tmpdir / "cache")
+    resolver = UrlResolver(cache_dir)
+    urls = [
+        write(str(tmpdir / "remote" / f"{i}.txt"), f"package-{i}==1\n")
+        for i in range(3)
+    ]
+    for url in urls:
+        resolver.fetch(url)
+    objects = [
+        os.path.join(directory, name)
+        for directory, _, names in os.walk(os.path.join(cache_dir, "objects"))
+        for name in names
+    ]
+    assert len(objects) == 3
+    for location in objects:
+        os.utime(location, ns=(0, 0))
+    # a cache hit makes the first URL content the most recently used
+    resolver.fetch(urls[0])
+
+    resolver.max_size = len(b"package-0==1\n")
+    assert resolver.evict() == 2
+    offline = UrlResolver(cache_dir, offline=True)
+    assert offline.fetch(urls[0]) == b"package-0==1\n"
+    with pytest.raises(InstallationError):
+        offline.fetch(urls[1])
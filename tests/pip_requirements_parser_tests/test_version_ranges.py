@@ -0,0 +1,79 @@
+
+# Copyright (c) nexB Inc.
+# SPDX-License-Identifier: MIT
+
+import itertools
+import random
+
+import pytest
+from packaging.specifiers import SpecifierSet
+
+from pip_requirements_parser import RequirementsFile
+from pip_requirements_parser import VersionRange
+from pip_requirements_parser import get_effective_constraints
+from pip_requirements_parser import get_version_range
+
+from pip_requirements_parser_tests.lib import requirements_file
+
+# final release versions only: the ranges do not model the PEP 440 special
+# cases of pre-releases and post-releases with exclusive comparisons
+VERSIONS = ["0.9", "1.0", "1.0.1", "1.4", "1.4.5", "1.4.9", "1.5", "2.0", "2.1", "3"]
+
+SPECIFIERS = [
+    f"{op}{version}"
+    for op, version in itertools.product(
+        ["==", "!=", ">=", ">", "<=", "<"], VERSIONS
+    )
+] + ["~=1.4.5", "~=1.4", "~=2.0", "==1.4.*", "!=1.4.*", "==1.*", "!=2.*", "===1.0"]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_get_version_range_contains_like_SpecifierSet(seed):
+    rnd = random.Random(seed)
+    for _ in range(50):
+        specifiers = ",".join(rnd.sample(SPECIFIERS, rnd.randint(1, 4)))
+        version_range = get_version_range(specifiers)
+        specifier_set = SpecifierSet(specifiers)
+        for version in VERSIONS + ["1.4.5.1", "1.10", "4.0"]:
+            expected = specifier_set.contains(version, prereleases=True)
+            assert version_range.contains(version) == expected, (specifiers, version)
+        if version_range.is_empty:
+            assert not any(specifier_set.contains(v, prereleases=True) for v in VERSIONS)
+
+
+def test_VersionRange_intersect_and_is_empty():
+    assert get_version_range("") == VersionRange.any()
+    assert get_version_range(None) == VersionRange.any()
+    assert str(get_version_range("~=1.4.5")) == "[1.4.5, 1.5.dev0)"
+    assert str(get_version_range("==1.0,==1.0.0")) == "[1.0, 1.0]"
+
+    both = get_version_range(">=1.0").intersect(get_version_range("<1.0"))
+    assert both.is_empty
+    assert str(both) == "(empty)"
+    assert not both.contains("1.0")
+
+    pinned = get_version_range("<=1.0").intersect(get_version_range(">=1.0"))
+    assert str(pinned) == "[1.0, 1.0]"
+    assert get_version_range(">=1").contains("not a version") is False
+
+
+def test_get_effective_constraints(tmpdir):
+    with requirements_file("Django>=3.0\nattrs==21.1\nsix\n-e ./local\n", tmpdir) as reqs:
+        base = RequirementsFile.from_file(str(reqs))
+    with requirements_file("django<3.2,!=3.1.*\nATTRS>=22\n", tmpdir) as reqs:
+        other = RequirementsFile.from_file(str(reqs))
+
+    constraints = get_effective_constraints([base, other])
+    assert sorted(constraints) == ["attrs", "django", "six"]
+
+    django = constraints["django"]
+    assert str(django.version_range) == "[3.0, 3.1.dev0) || [3.2.dev0, 3.2)"
+    assert not django.is_conflicting
+    assert len(django.requirements) == 2
+
+    attrs = constraints["attrs"]
+    assert attrs.is_conflicting
+    assert attrs.to_dict()["version_range"] == "(empty)"
+
+    assert constraints["six"].version_range == VersionRange.any()
+    assert base.requirements[0].version_range.contains("4.0")
@@ -14,6 +14,8 @@ from unittest.mock import Mock, patch
 import pytest
 
 from pip_requirements_parser import BOMS, auto_decode
+from pip_requirements_parser import decode_stream
+from pip_requirements_parser import get_fallback_encoding
 from pip_requirements_parser import split_auth_from_netloc
 
 
@@ -58,11 +60,52 @@ class TestEncoding:
         om.return_value = "ascii"
         em.return_value = None
         data = "data"
-        with patch("sys.getdefaultencoding", om):
-            with patch("locale.getpreferredencoding", em):
-                ret = auto_decode(data.encode(sys.getdefaultencoding()))
+        get_fallback_encoding.cache_clear()
+        try:
+            with patch("sys.getdefaultencoding", om):
+                with patch("locale.getpreferredencoding", em):
+                    ret = auto_decode(data.encode(sys.getdefaultencoding()))
+                    assert get_fallback_encoding() == "ascii"
+        finally:
+            get_fallback_encoding.cache_clear()
         assert ret == data
 
+    def test_auto_decode_non_ascii_uses_cached_fallback_encoding(self) -> None:
+        get_fallback_encoding.cache_clear()
+        try:
+            with patch("locale.getpreferredencoding", Mock(return_value="latin1")):
+                assert auto_decode("café".encode("latin1")) == "café"
+            # the fallback encoding is computed once
+            assert auto_decode("café".encode("latin1")) == "café"
+        finally:
+            get_fallback_encoding.cache_clear()
+
+    def test_auto_decode_only_checks_the_first_two_lines(self) -> None:
+        data = "foo\n\n# coding=latin1\ncafé".encode("utf-8")
+        with patch("locale.getpreferredencoding", Mock(return_value="utf-8")):
+            get_fallback_encoding.cache_clear()
+            try:
+                assert auto_decode(data) == data.decode("utf-8")
+            finally:
+                get_fallback_encoding.cache_clear()
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 4096])
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"",
+            b"django==1.4\n",
+            "# coding=latin1\n# Pas trop de café\n".encode("latin1"),
+            codecs.BOM_UTF8 + "café\n".encode("utf-8") * 3000,
+            codecs.BOM_UTF16_LE + "Django==1.4.2\n".encode("utf-16-le"),
+            codecs.BOM_UTF16_BE + "Django==1.4.2\n".encode("utf-16-be"),
+            codecs.BOM_UTF32_BE + "Django==1.4.2\n".encode("utf-32-be"),
+        ],
+    )
+    def test_decode_stream_is_like_auto_decode(self, data: bytes, chunk_size: int) -> None:
+        chunks = [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+        assert "".join(decode_stream(chunks)) == auto_decode(data)
+
     @pytest.mark.parametrize("encoding", [encoding for bom, encoding in BOMS])
     def test_all_encodings_are_valid(self, encoding: str) -> None:
         # we really only care that there is no LookupError